@@ -1,9 +1,59 @@
-from flask import Flask, render_template, request, jsonify
-from nlp_utils import process_content, generate_rewrite
-import traceback
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context, url_for
+from flask.json.provider import JSONProvider
+from nlp_utils import process_content, generate_rewrite, generate_rewrite_stream
+from llm_cache import track_lookups, cache_status
+from tasks import TaskRunner, TASK_WORKERS
+import logging
+import orjson
 from datetime import datetime
 
-app = Flask(__name__)
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson for faster jsonify and request parsing"""
+    
+    # Keys are sorted to match Flask's default provider output
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.options).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class ContentOptimizerApp(Flask):
+    json_provider_class = ORJSONProvider
+
+app = ContentOptimizerApp(__name__)
+
+# Background jobs for the /optimize/async and /rewrite/async endpoints
+task_runner = TaskRunner(max_workers=TASK_WORKERS)
+
+def set_default_params(data):
+    """Fill in default values for optional fields"""
+    data.setdefault('target_readability', 8)
+    data.setdefault('target_audience', 'general audience')
+    data.setdefault('target_tone', 'professional')
+    data.setdefault('optimization_goal', 'engagement')
+
+def run_optimize(data):
+    """Analyze content and build the /optimize response body"""
+    report, recommendations = process_content(data)
+    return {
+        'success': True,
+        'report': report,
+        'recommendations': recommendations
+    }
+
+def run_rewrite(data):
+    """Rewrite content and build the /rewrite response body"""
+    rewritten, assets = generate_rewrite(data)
+    return {
+        'success': True,
+        'rewritten': rewritten,
+        'assets': assets
+    }
 
 @app.route('/')
 def index():
@@ -12,44 +62,36 @@ def index():
 @app.route('/optimize', methods=['POST'])
 def optimize():
     try:
-        print("Received request to /optimize")
+        logger.debug("Received request to /optimize")
         data = request.json
-        print(f"Request data: {data}")
+        logger.debug("Request data: %s", data)
         
         # Validate required fields
         if not data:
-            print("Error: No JSON data received")
+            logger.debug("Error: No JSON data received")
             return jsonify({'error': 'No data received'}), 400
             
         if not data.get('content'):
-            print("Error: Content is missing")
+            logger.debug("Error: Content is missing")
             return jsonify({'error': 'Content is required'}), 400
         
         content_length = len(data.get('content', ''))
-        print(f"Content length: {content_length}")
+        logger.debug("Content length: %d", content_length)
         
         if content_length == 0:
             return jsonify({'error': 'Content cannot be empty'}), 400
         
         # Set default values for optional fields
-        data.setdefault('target_readability', 8)
-        data.setdefault('target_audience', 'general audience')
-        data.setdefault('target_tone', 'professional')
-        data.setdefault('optimization_goal', 'engagement')
+        set_default_params(data)
         
-        print("Processing content...")
-        report, recommendations = process_content(data)
-        print("Content processed successfully")
+        logger.debug("Processing content...")
+        result = run_optimize(data)
+        logger.debug("Content processed successfully")
         
-        return jsonify({
-            'success': True,
-            'report': report,
-            'recommendations': recommendations
-        })
+        return jsonify(result)
     
     except Exception as e:
-        print(f"Error in optimize route: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in optimize route: %s", e)
         return jsonify({
             'success': False,
             'error': f'An error occurred while processing your content: {str(e)}'
@@ -65,27 +107,85 @@ def rewrite():
             return jsonify({'error': 'Content is required'}), 400
         
         # Set default values for optional fields
-        data.setdefault('target_readability', 8)
-        data.setdefault('target_audience', 'general audience')
-        data.setdefault('target_tone', 'professional')
-        data.setdefault('optimization_goal', 'engagement')
-        
-        rewritten, assets = generate_rewrite(data)
+        set_default_params(data)
         
-        return jsonify({
-            'success': True,
-            'rewritten': rewritten,
-            'assets': assets
-        })
+        with track_lookups() as cache_lookups:
+            result = run_rewrite(data)
+        response = jsonify(result)
+        response.headers['X-Cache'] = cache_status(cache_lookups)
+        return response
     
     except Exception as e:
-        print(f"Error in rewrite route: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in rewrite route: %s", e)
         return jsonify({
             'success': False,
             'error': f'An error occurred while rewriting your content: {str(e)}'
         }), 500
 
+@app.route('/rewrite/stream', methods=['POST'])
+def rewrite_stream():
+    """Stream the AI rewrite as server-sent events, followed by the generated assets"""
+    data = request.json
+    if not data or not data.get('content'):
+        return jsonify({'error': 'Content is required'}), 400
+    
+    set_default_params(data)
+    
+    def events():
+        for event, payload in generate_rewrite_stream(data):
+            yield f"event: {event}\ndata: {app.json.dumps(payload)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/optimize/async', methods=['POST'])
+def optimize_async():
+    """Queue content analysis and return a task id to poll"""
+    data = request.json
+    if not data or not data.get('content'):
+        return jsonify({'error': 'Content is required'}), 400
+    
+    set_default_params(data)
+    task_id = task_runner.submit(run_optimize, data)
+    return jsonify({
+        'task_id': task_id,
+        'status_url': url_for('optimize_status', task_id=task_id)
+    }), 202
+
+@app.route('/optimize/status/<task_id>', methods=['GET'])
+def optimize_status(task_id):
+    """Report the state of a queued analysis"""
+    return task_status_response(task_id)
+
+@app.route('/rewrite/async', methods=['POST'])
+def rewrite_async():
+    """Queue an AI rewrite and return a task id to poll"""
+    data = request.json
+    if not data or not data.get('content'):
+        return jsonify({'error': 'Content is required'}), 400
+    
+    set_default_params(data)
+    task_id = task_runner.submit(run_rewrite, data)
+    return jsonify({
+        'task_id': task_id,
+        'status_url': url_for('rewrite_status', task_id=task_id)
+    }), 202
+
+@app.route('/rewrite/status/<task_id>', methods=['GET'])
+def rewrite_status(task_id):
+    """Report the state of a queued rewrite"""
+    return task_status_response(task_id)
+
+def task_status_response(task_id):
+    status = task_runner.status(task_id)
+    if status is None:
+        return jsonify({'error': 'Unknown or expired task id'}), 404
+    return jsonify(status)
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -1,17 +1,101 @@
 import requests
 import json
-import time
+import orjson
+import os
+import re
+import string
+from functools import lru_cache
+from llm_cache import LLMCache, SingleFlight, make_semantic_cache, record_lookup
+from rate_limiter import KeyPool
 
 # Hardcoded API key - not visible to users
 GEMINI_API_KEY = "ENTER_YOUR_API_KEY"
+# Optional comma-separated pool of keys to rotate across; falls back to the key above
+GEMINI_API_KEYS = [key.strip() for key in os.environ.get('GEMINI_API_KEYS', '').split(',') if key.strip()] or [GEMINI_API_KEY]
+GEMINI_MODEL = "gemini-2.0-flash-exp"
 
-def gemini_rewrite(content, recommendations=None, target_params=None, api_key=None):
-    """Rewrite content using Gemini AI with specific recommendations"""
-    # Use hardcoded key if none provided, or ignore provided key
-    actual_api_key = GEMINI_API_KEY
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={actual_api_key}"
-    headers = {"Content-Type": "application/json"}
-    
+# Response caches; rewrites are kept longer than generated assets
+_REWRITE_CACHE = LLMCache(maxsize=1024, ttl=4 * 3600, namespace='gemini:rewrite')
+_ASSETS_CACHE = LLMCache(maxsize=1024, ttl=3600, namespace='gemini:assets')
+# Optional near-duplicate cache for rewrites (None unless enabled)
+_SEMANTIC_CACHE = make_semantic_cache()
+# Deduplicates concurrent identical Gemini calls on cache misses
+_IN_FLIGHT = SingleFlight()
+
+# Shared session so Gemini calls reuse pooled keep-alive TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=50))
+
+# Requests per minute allowed by the Gemini quota, per key (free tier default)
+GEMINI_RPM = int(os.environ.get('GEMINI_RPM', 15))
+# Buckets are per process, so each gunicorn worker gets an equal share of the quota
+_WORKER_COUNT = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)
+_WORKER_RPM = GEMINI_RPM / _WORKER_COUNT
+# A one-request burst: a full minute's worth up front plus the refill would
+# admit up to twice the quota in the first minute
+_KEY_POOL = KeyPool(GEMINI_API_KEYS, rate=_WORKER_RPM / 60, capacity=1)
+
+class GeminiRateLimited(Exception):
+    """Raised when no request slot frees up within the wait budget"""
+
+def _retry_after(response, default):
+    try:
+        return float(response.headers.get('Retry-After', default))
+    except ValueError:
+        return default
+
+# Calls are sent one per request rather than coalesced into :batchGenerateContent.
+# Gemini batch jobs are queued and polled with a turnaround measured in minutes
+# to hours, which is far too slow for the interactive /rewrite flow.
+def _post_gemini(url, payload, headers, max_retries=2, stream=False):
+    """POST to Gemini with the next available pooled key, rotating keys on 429"""
+    for attempt in range(max_retries + 1):
+        api_key = _KEY_POOL.acquire(timeout=30)
+        if api_key is None:
+            raise GeminiRateLimited()
+        response = _SESSION.post(url, data=orjson.dumps(payload), headers={**headers, "x-goog-api-key": api_key}, timeout=30, stream=stream)
+        if response.status_code != 429 or attempt == max_retries:
+            return response
+        response.close()
+        # This key is over quota; rest it and retry with the next one
+        _KEY_POOL.cool_down(api_key, _retry_after(response, min(2 ** attempt, 30)))
+
+# Formatting rules shared by every rewrite, sent as the system instruction and
+# built once at import rather than on every request.
+_REWRITE_SYSTEM_INSTRUCTION = "\n".join([
+    "You rewrite content to improve its readability, structure and engagement.",
+    "",
+    "IMPORTANT FORMATTING REQUIREMENTS:",
+    "1. Use proper Markdown formatting with headers (# ## ###)",
+    "2. Add a compelling H1 title at the beginning",
+    "3. Structure content with clear sections using H2 and H3 headers",
+    "4. Use bullet points and numbered lists where appropriate",
+    "5. Make paragraphs concise (2-3 sentences max)",
+    "6. Add bold text for **key points** and emphasis",
+    "7. Include relevant subheadings to break up content",
+    "8. Ensure minimum 300 words for better SEO",
+    "",
+    "Always provide a well-structured, engaging rewrite in Markdown format that addresses all the above requirements.",
+])
+
+_REWRITE_PROMPT_HEADER = "Please rewrite the following content with these specific improvements:\n\n"
+_REWRITE_DEFAULT_IMPROVEMENTS = "Improve overall readability and engagement"
+
+_TARGET_INFO_TEMPLATE = string.Template("""
+Target Requirements:
+- Audience: $audience
+- Reading Level: Grade $grade (use simpler sentences and vocabulary)
+- Tone: $tone
+- Goal: $goal
+""")
+
+@lru_cache(maxsize=256)
+def _target_info(audience, grade, tone, goal):
+    """Target requirements block; most requests reuse a few parameter combinations"""
+    return _TARGET_INFO_TEMPLATE.safe_substitute(audience=audience, grade=grade, tone=tone, goal=goal)
+
+def _build_rewrite_request(content, recommendations, target_params):
+    """Build the rewrite prompt, its target requirements text and payload"""
     # Build intelligent prompt based on recommendations
     improvement_points = []
     if recommendations:
@@ -21,40 +105,32 @@ def gemini_rewrite(content, recommendations=None, target_params=None, api_key=No
     
     target_info = ""
     if target_params:
-        target_info = f"""
-Target Requirements:
-- Audience: {target_params.get('target_audience', 'general audience')}
-- Reading Level: Grade {target_params.get('target_readability', 8)} (use simpler sentences and vocabulary)
-- Tone: {target_params.get('target_tone', 'professional')}
-- Goal: {target_params.get('optimization_goal', 'engagement')}
-"""
+        target_info = _target_info(
+            str(target_params.get('target_audience', 'general audience')),
+            str(target_params.get('target_readability', 8)),
+            str(target_params.get('target_tone', 'professional')),
+            str(target_params.get('optimization_goal', 'engagement'))
+        )
     
-    improvements_text = "\n".join(improvement_points) if improvement_points else "Improve overall readability and engagement"
+    improvements_text = "\n".join(improvement_points) if improvement_points else _REWRITE_DEFAULT_IMPROVEMENTS
     
-    enhanced_prompt = f"""Please rewrite the following content with these specific improvements:
-
-{improvements_text}
-
-{target_info}
-
-IMPORTANT FORMATTING REQUIREMENTS:
-1. Use proper Markdown formatting with headers (# ## ###)
-2. Add a compelling H1 title at the beginning
-3. Structure content with clear sections using H2 and H3 headers
-4. Use bullet points and numbered lists where appropriate
-5. Make paragraphs concise (2-3 sentences max)
-6. Add bold text for **key points** and emphasis
-7. Include relevant subheadings to break up content
-8. Ensure minimum 300 words for better SEO
-9. Use simple vocabulary suitable for grade {target_params.get('target_readability', 8) if target_params else 8} reading level
-
-Original Content:
-{content}
-
-Please provide a well-structured, engaging rewrite in Markdown format that addresses all the above requirements."""
+    reading_grade = target_params.get('target_readability', 8) if target_params else 8
     
+    enhanced_prompt = "".join([
+        _REWRITE_PROMPT_HEADER,
+        improvements_text, "\n\n",
+        target_info, "\n",
+        "Use simple vocabulary suitable for grade ", str(reading_grade), " reading level.\n\n",
+        "Original Content:\n",
+        content
+    ])
     
     payload = {
+        "systemInstruction": {
+            "parts": [{
+                "text": _REWRITE_SYSTEM_INSTRUCTION
+            }]
+        },
         "contents": [{
             "parts": [{
                 "text": enhanced_prompt
@@ -68,20 +144,26 @@ Please provide a well-structured, engaging rewrite in Markdown format that addre
         }
     }
     
+    return enhanced_prompt, target_info, payload
+
+def _fetch_rewrite(url, payload, headers, cache_key, semantic_context=None, content_probe=None):
+    """Call Gemini for a rewrite and cache the result"""
     try:
-        # Add delay to avoid rate limits
-        time.sleep(1)
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = _post_gemini(url, payload, headers)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             if 'candidates' in result and len(result['candidates']) > 0:
-                return result['candidates'][0]['content']['parts'][0]['text']
+                rewritten = result['candidates'][0]['content']['parts'][0]['text']
+                _store_rewrite(rewritten, cache_key, semantic_context, content_probe)
+                return rewritten
             else:
                 return f"[AI Enhancement: Unable to process content at this time]"
         elif response.status_code == 429:
             return f"[AI Enhancement: Service temporarily unavailable due to high demand. Please try again later.]"
         else:
             return f"[AI Enhancement: Service temporarily unavailable. Your original content analysis is still available above.]"
+    except GeminiRateLimited:
+        return f"[AI Enhancement: Service temporarily unavailable due to high demand. Please try again later.]"
     except requests.exceptions.Timeout:
         return "[AI Enhancement: Request timeout. Please try again with shorter content.]"
     except requests.exceptions.RequestException as e:
@@ -89,81 +171,108 @@ Please provide a well-structured, engaging rewrite in Markdown format that addre
     except Exception as e:
         return f"[AI Enhancement: Temporarily unavailable. Please use the content analysis results above.]"
 
-def gemini_generate_assets(content, target_params, api_key=None):
-    """Generate additional content assets using Gemini AI"""
-    # Use hardcoded key if none provided, or ignore provided key
-    actual_api_key = GEMINI_API_KEY
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={actual_api_key}"
+def _lookup_rewrite(content, enhanced_prompt, target_info, payload):
+    """Check the exact and semantic rewrite caches before any rate limiting or network work"""
+    cache_key = _REWRITE_CACHE.cache_key(GEMINI_MODEL, enhanced_prompt, payload['generationConfig'])
+    cached = _REWRITE_CACHE.get(cache_key)
+    semantic_context = content_probe = None
+    if cached is None and _SEMANTIC_CACHE is not None:
+        # Recommendations quote numbers measured from the content itself, so paraphrases
+        # would never share a context; group by target params and generation config only
+        semantic_context = _REWRITE_CACHE.cache_key(GEMINI_MODEL, target_info, payload['generationConfig'])
+        # None when the content is too long to embed without truncation
+        content_probe = _SEMANTIC_CACHE.probe(content)
+        if content_probe is not None:
+            cached = _SEMANTIC_CACHE.get(semantic_context, content_probe)
+    record_lookup(cached is not None)
+    return cached, cache_key, semantic_context, content_probe
+
+def _store_rewrite(rewritten, cache_key, semantic_context=None, content_probe=None):
+    _REWRITE_CACHE.set(cache_key, rewritten)
+    if _SEMANTIC_CACHE is not None and content_probe is not None:
+        _SEMANTIC_CACHE.set(semantic_context, content_probe, rewritten)
+
+def gemini_rewrite(content, recommendations=None, target_params=None, api_key=None):
+    """Rewrite content using Gemini AI with specific recommendations"""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
     headers = {"Content-Type": "application/json"}
+    enhanced_prompt, target_info, payload = _build_rewrite_request(content, recommendations, target_params)
     
-    prompt = f"""
-    Based on the following content, generate comprehensive marketing and SEO assets:
-
-    Content: {content[:1000]}...  # Truncate for API limits
-    
-    Target Audience: {target_params.get('target_audience', 'general audience')}
-    Target Tone: {target_params.get('target_tone', 'professional')}
-    Optimization Goal: {target_params.get('optimization_goal', 'engagement')}
-
-    Please provide a JSON response with the following structure:
-    {{
-        "headlines": ["headline1", "headline2", "headline3"],
-        "meta_description": "SEO-optimized meta description under 155 characters",
-        "faqs": [
-            {{"question": "question1", "answer": "answer1"}},
-            {{"question": "question2", "answer": "answer2"}},
-            {{"question": "question3", "answer": "answer3"}}
-        ],
-        "cta_options": ["CTA1", "CTA2", "CTA3", "CTA4"],
-        "summary": "Brief content summary",
-        "keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"],
-        "social_media_posts": {{
-            "twitter": "Tweet-length version",
-            "linkedin": "Professional LinkedIn post",
-            "facebook": "Engaging Facebook post"
-        }}
-    }}
-
-    Ensure all content is optimized for the specified target audience and tone.
-    """
+    cached, cache_key, semantic_context, content_probe = _lookup_rewrite(content, enhanced_prompt, target_info, payload)
+    if cached is not None:
+        return cached
     
-    payload = {
-        "contents": [{
-            "parts": [{
-                "text": prompt
-            }]
-        }],
-        "generationConfig": {
-            "temperature": 0.8,
-            "maxOutputTokens": 2048,
-            "topP": 0.9,
-            "topK": 40
-        }
-    }
+    # Identical requests already in flight wait for that call instead of repeating it
+    return _IN_FLIGHT.do(cache_key, lambda: _fetch_rewrite(url, payload, headers, cache_key, semantic_context, content_probe))
+
+def gemini_rewrite_stream(content, recommendations=None, target_params=None):
+    """Rewrite content like gemini_rewrite, yielding text chunks as Gemini produces them"""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:streamGenerateContent?alt=sse"
+    headers = {"Content-Type": "application/json"}
+    enhanced_prompt, target_info, payload = _build_rewrite_request(content, recommendations, target_params)
+    
+    # Cache hits are served as a single chunk without waiting on the rate limiter
+    cached, cache_key, semantic_context, content_probe = _lookup_rewrite(content, enhanced_prompt, target_info, payload)
+    if cached is not None:
+        yield cached
+        return
     
     try:
-        # Add delay to avoid rate limits
-        time.sleep(1)
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = _post_gemini(url, payload, headers, stream=True)
+        with response:
+            if response.status_code == 429:
+                yield "[AI Enhancement: Service temporarily unavailable due to high demand. Please try again later.]"
+                return
+            elif response.status_code != 200:
+                yield "[AI Enhancement: Service temporarily unavailable. Your original content analysis is still available above.]"
+                return
+            
+            # SSE frames: one "data: {...}" line per partial GenerateContentResponse
+            response.encoding = 'utf-8'
+            chunks = []
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                result = orjson.loads(line[5:])
+                if result.get('candidates'):
+                    for part in result['candidates'][0].get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            chunks.append(part['text'])
+                            yield part['text']
+            
+            if chunks:
+                _store_rewrite("".join(chunks), cache_key, semantic_context, content_probe)
+    except GeminiRateLimited:
+        yield "[AI Enhancement: Service temporarily unavailable due to high demand. Please try again later.]"
+    except requests.exceptions.Timeout:
+        yield "[AI Enhancement: Request timeout. Please try again with shorter content.]"
+    except Exception as e:
+        yield "[AI Enhancement: Temporarily unavailable. Please use the content analysis results above.]"
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _fetch_assets(url, payload, headers, cache_key):
+    """Call Gemini for marketing assets and cache the result"""
+    try:
+        response = _post_gemini(url, payload, headers)
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             if 'candidates' in result and len(result['candidates']) > 0:
                 generated_text = result['candidates'][0]['content']['parts'][0]['text']
                 
                 # Try to extract JSON from the response
                 try:
-                    # Look for JSON in the response
+                    # Decode the first JSON object, ignoring any prose or code fences after it
                     start_idx = generated_text.find('{')
-                    end_idx = generated_text.rfind('}') + 1
-                    if start_idx != -1 and end_idx != -1:
-                        json_str = generated_text[start_idx:end_idx]
-                        assets = json.loads(json_str)
-                        return assets
+                    if start_idx != -1:
+                        assets, _ = _JSON_DECODER.raw_decode(generated_text, start_idx)
                     else:
                         # Fallback to parsing text response
-                        return parse_text_assets(generated_text)
+                        assets = parse_text_assets(generated_text)
                 except json.JSONDecodeError:
-                    return parse_text_assets(generated_text)
+                    assets = parse_text_assets(generated_text)
+                _ASSETS_CACHE.set(cache_key, assets)
+                return assets
             else:
                 return get_default_assets()
         else:
@@ -171,6 +280,84 @@ def gemini_generate_assets(content, target_params, api_key=None):
     except Exception as e:
         return get_default_assets()
 
+# Fixed parts of the asset prompt
+_ASSETS_PROMPT_HEADER = "Based on the following content, generate comprehensive marketing and SEO assets:\n\nContent: "
+_ASSETS_PROMPT_SCHEMA = """
+Please provide a JSON response with the following structure:
+{
+    "headlines": ["headline1", "headline2", "headline3"],
+    "meta_description": "SEO-optimized meta description under 155 characters",
+    "faqs": [
+        {"question": "question1", "answer": "answer1"},
+        {"question": "question2", "answer": "answer2"},
+        {"question": "question3", "answer": "answer3"}
+    ],
+    "cta_options": ["CTA1", "CTA2", "CTA3", "CTA4"],
+    "summary": "Brief content summary",
+    "keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"],
+    "social_media_posts": {
+        "twitter": "Tweet-length version",
+        "linkedin": "Professional LinkedIn post",
+        "facebook": "Engaging Facebook post"
+    }
+}
+
+Ensure all content is optimized for the specified target audience and tone.
+"""
+
+def gemini_generate_assets(content, target_params, api_key=None):
+    """Generate additional content assets using Gemini AI"""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+    headers = {"Content-Type": "application/json"}
+    
+    # Content is truncated to keep the request within API limits
+    prompt = "".join([
+        _ASSETS_PROMPT_HEADER,
+        content[:1000], "...\n\n",
+        "Target Audience: ", str(target_params.get('target_audience', 'general audience')), "\n",
+        "Target Tone: ", str(target_params.get('target_tone', 'professional')), "\n",
+        "Optimization Goal: ", str(target_params.get('optimization_goal', 'engagement')), "\n",
+        _ASSETS_PROMPT_SCHEMA
+    ])
+    
+    payload = {
+        "contents": [{
+            "parts": [{
+                "text": prompt
+            }]
+        }],
+        "generationConfig": {
+            "temperature": 0.8,
+            "maxOutputTokens": 2048,
+            "topP": 0.9,
+            "topK": 40
+        }
+    }
+    
+    cache_key = _ASSETS_CACHE.cache_key(GEMINI_MODEL, prompt, payload['generationConfig'])
+    cached = _ASSETS_CACHE.get(cache_key)
+    record_lookup(cached is not None)
+    if cached is not None:
+        return cached
+    
+    return _IN_FLIGHT.do(cache_key, lambda: _fetch_assets(url, payload, headers, cache_key))
+
+# Section keywords for plain-text asset responses; matched anywhere in a line
+# so markdown headers like "## Headlines" or "**Keywords:**" still count
+_SECTION_RE = re.compile(r'(headline|meta description|faq|cta|call to action|summary|keyword)', re.IGNORECASE)
+_SECTION_NAMES = {
+    'headline': 'headlines',
+    'meta description': 'meta_description',
+    'faq': 'faqs',
+    'cta': 'cta_options',
+    'call to action': 'cta_options',
+    'summary': 'summary',
+    'keyword': 'keywords'
+}
+_BULLET_PREFIXES = ('- ', '• ')
+# Sections collected from bullet items, with the length an item must exceed
+_BULLET_MIN_LENGTHS = {'headlines': 10, 'cta_options': 5, 'keywords': 2}
+
 def parse_text_assets(text):
     """Parse assets from plain text response if JSON parsing fails"""
     assets = {
@@ -183,69 +370,66 @@ def parse_text_assets(text):
         "social_media_posts": {}
     }
     
-    lines = text.split('\n')
     current_section = None
     
-    for line in lines:
+    for line in text.splitlines():
         line = line.strip()
-        if 'headline' in line.lower():
-            current_section = 'headlines'
-        elif 'meta description' in line.lower():
-            current_section = 'meta_description'
-        elif 'faq' in line.lower():
-            current_section = 'faqs'
-        elif 'cta' in line.lower() or 'call to action' in line.lower():
-            current_section = 'cta_options'
-        elif 'summary' in line.lower():
-            current_section = 'summary'
-        elif 'keyword' in line.lower():
-            current_section = 'keywords'
-        elif line.startswith('- ') or line.startswith('• '):
-            content = line[2:].strip()
-            if current_section == 'headlines' and len(content) > 10:
-                assets['headlines'].append(content)
-            elif current_section == 'cta_options' and len(content) > 5:
-                assets['cta_options'].append(content)
-            elif current_section == 'keywords' and len(content) > 2:
-                assets['keywords'].append(content)
+        if not line:
+            continue
+        
+        section_match = _SECTION_RE.search(line)
+        if section_match:
+            current_section = _SECTION_NAMES[section_match.group(1).lower()]
+        elif line.startswith(_BULLET_PREFIXES):
+            min_length = _BULLET_MIN_LENGTHS.get(current_section)
+            if min_length is not None:
+                content = line[2:].strip()
+                if len(content) > min_length:
+                    assets[current_section].append(content)
     
     # Fill with defaults if parsing didn't work well
     if len(assets['headlines']) < 3:
-        assets['headlines'] = get_default_assets()['headlines']
+        assets['headlines'] = _DEFAULT_ASSETS['headlines']
     if not assets['meta_description']:
-        assets['meta_description'] = get_default_assets()['meta_description']
+        assets['meta_description'] = _DEFAULT_ASSETS['meta_description']
     if len(assets['faqs']) < 3:
-        assets['faqs'] = get_default_assets()['faqs']
+        assets['faqs'] = _DEFAULT_ASSETS['faqs']
     if len(assets['cta_options']) < 3:
-        assets['cta_options'] = get_default_assets()['cta_options']
+        assets['cta_options'] = _DEFAULT_ASSETS['cta_options']
     
     return assets
 
-def get_default_assets():
-    """Provide default assets when AI generation fails"""
-    return {
-        "headlines": [
-            "Transform Your Content with AI-Powered Optimization",
-            "Boost Engagement with Smart Content Enhancement",
-            "Professional Content Optimization Made Easy"
-        ],
-        "meta_description": "Optimize your content with AI-powered tools for better readability, SEO, and engagement. Get actionable recommendations instantly.",
-        "faqs": [
-            {"question": "What is content optimization?", "answer": "Content optimization is the process of improving your content's readability, SEO performance, and engagement potential using data-driven insights."},
-            {"question": "How does AI help with content optimization?", "answer": "AI analyzes your content for readability, tone, structure, and SEO factors, then provides specific recommendations for improvement."},
-            {"question": "What metrics are analyzed?", "answer": "We analyze readability scores, keyword density, heading structure, tone detection, and passive voice usage among other factors."}
-        ],
-        "cta_options": [
-            "Optimize Your Content Now",
-            "Get Started Today",
-            "Improve Your Content",
-            "Try Content Optimization"
-        ],
-        "summary": "This content provides comprehensive guidance on optimizing written material for better performance and engagement.",
-        "keywords": ["content optimization", "SEO", "readability", "AI tools", "content marketing"],
-        "social_media_posts": {
-            "twitter": "🚀 Optimize your content with AI! Get instant feedback on readability, SEO, and engagement. #ContentMarketing #AI",
-            "linkedin": "Transform your content strategy with AI-powered optimization. Analyze readability, improve SEO, and boost engagement with data-driven insights.",
-            "facebook": "Want better content performance? Our AI tool analyzes your writing and provides actionable recommendations to improve readability and engagement!"
-        }
+# Fallback assets, built once at import
+_DEFAULT_ASSETS = {
+    "headlines": [
+        "Transform Your Content with AI-Powered Optimization",
+        "Boost Engagement with Smart Content Enhancement",
+        "Professional Content Optimization Made Easy"
+    ],
+    "meta_description": "Optimize your content with AI-powered tools for better readability, SEO, and engagement. Get actionable recommendations instantly.",
+    "faqs": [
+        {"question": "What is content optimization?", "answer": "Content optimization is the process of improving your content's readability, SEO performance, and engagement potential using data-driven insights."},
+        {"question": "How does AI help with content optimization?", "answer": "AI analyzes your content for readability, tone, structure, and SEO factors, then provides specific recommendations for improvement."},
+        {"question": "What metrics are analyzed?", "answer": "We analyze readability scores, keyword density, heading structure, tone detection, and passive voice usage among other factors."}
+    ],
+    "cta_options": [
+        "Optimize Your Content Now",
+        "Get Started Today",
+        "Improve Your Content",
+        "Try Content Optimization"
+    ],
+    "summary": "This content provides comprehensive guidance on optimizing written material for better performance and engagement.",
+    "keywords": ["content optimization", "SEO", "readability", "AI tools", "content marketing"],
+    "social_media_posts": {
+        "twitter": "🚀 Optimize your content with AI! Get instant feedback on readability, SEO, and engagement. #ContentMarketing #AI",
+        "linkedin": "Transform your content strategy with AI-powered optimization. Analyze readability, improve SEO, and boost engagement with data-driven insights.",
+        "facebook": "Want better content performance? Our AI tool analyzes your writing and provides actionable recommendations to improve readability and engagement!"
     }
+}
+
+def get_default_assets():
+    """Provide default assets when AI generation fails
+
+    Returns a shared module-level dict; callers must not mutate it.
+    """
+    return _DEFAULT_ASSETS
@@ -0,0 +1,17 @@
+# Gunicorn settings for production serving: gunicorn -c gunicorn.conf.py app:app
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Gemini calls spend most of their time waiting on the network, so each worker
+# runs a thread pool and keeps serving other requests while calls are in flight.
+worker_class = 'gthread'
+# One worker by default: async task state lives in the process that accepted the
+# job, so status polls must reach that same process. Only raise WEB_CONCURRENCY
+# behind sticky sessions.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+# Gemini requests time out after 30s; leave headroom for analysis and retries
+timeout = 120
+keepalive = 5
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import logging
+import orjson
+import os
+import re
+import threading
+import time
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import Future
+
+from cachetools import TTLCache
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Gemini is called with temperature 0.7/0.8, so the same prompt can legitimately
+# produce different rewrites. Caching trades that variety for latency and quota:
+# a repeated request gets the first answer back until the entry expires.
+
+REDIS_URL_ENV = 'GEMINI_CACHE_REDIS_URL'
+SEMANTIC_CACHE_ENV = 'GEMINI_SEMANTIC_CACHE'
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_request_lookups = contextvars.ContextVar('llm_cache_request_lookups', default=None)
+
+def normalize(text):
+    """Lowercase and collapse whitespace so trivial variations share a key"""
+    return _WHITESPACE_RE.sub(' ', text.strip().lower())
+
+@contextmanager
+def track_lookups():
+    """Record cache hits/misses for the current request until the block exits"""
+    lookups = []
+    # Reset on exit: gthread workers reuse threads, and their context with them
+    token = _request_lookups.set(lookups)
+    try:
+        yield lookups
+    finally:
+        _request_lookups.reset(token)
+
+def record_lookup(hit):
+    """Record one cache outcome against the current request, if tracked"""
+    lookups = _request_lookups.get()
+    if lookups is not None:
+        lookups.append(hit)
+
+def cache_status(lookups):
+    """Summarise recorded lookups as an X-Cache header value"""
+    return 'HIT' if lookups and all(lookups) else 'MISS'
+
+class MemoryCacheBackend:
+    """Per-process TTL cache"""
+
+    def __init__(self, maxsize, ttl):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def delete(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+class RedisCacheBackend:
+    """Redis cache shared by all workers; errors fall through to the live API
+
+    After a Redis error the backend is bypassed for `retry_after` seconds, so an
+    outage costs one socket timeout rather than one per cache call.
+    """
+
+    def __init__(self, url, ttl, namespace, retry_after=30):
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.ttl = ttl
+        self.namespace = namespace
+        self.retry_after = retry_after
+        self._bypass_until = 0
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def _available(self):
+        return time.monotonic() >= self._bypass_until
+
+    def _trip(self, operation, error):
+        self._bypass_until = time.monotonic() + self.retry_after
+        logger.warning("Redis cache %s failed, bypassing Redis for %ss: %s", operation, self.retry_after, error)
+
+    def get(self, key):
+        if not self._available():
+            return None
+        try:
+            raw = self.client.get(self._key(key))
+        except redis.RedisError as e:
+            self._trip('get', e)
+            return None
+        if raw is None:
+            return None
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            # Corrupt or foreign value under our key; treat it as a miss
+            logger.warning("Redis cache value for %s is not valid JSON: %s", self._key(key), e)
+            return None
+
+    def set(self, key, value):
+        if not self._available():
+            return
+        try:
+            self.client.setex(self._key(key), self.ttl, orjson.dumps(value))
+        except redis.RedisError as e:
+            self._trip('set', e)
+
+    def delete(self, key):
+        if not self._available():
+            return
+        try:
+            self.client.delete(self._key(key))
+        except redis.RedisError as e:
+            self._trip('delete', e)
+
+def _make_backend(maxsize, ttl, namespace):
+    redis_url = os.environ.get(REDIS_URL_ENV)
+    if redis_url:
+        if redis is not None:
+            return RedisCacheBackend(redis_url, ttl, namespace)
+        logger.warning("%s is set but redis is not installed; using in-process cache", REDIS_URL_ENV)
+    return MemoryCacheBackend(maxsize, ttl)
+
+class LLMCache:
+    """Exact-match cache for Gemini responses (Redis if configured, else in-process)"""
+
+    def __init__(self, maxsize=1024, ttl=3600, namespace='gemini'):
+        self.backend = _make_backend(maxsize, ttl, namespace)
+
+    @staticmethod
+    def cache_key(model, prompt, generation_config):
+        """Build a SHA256 key from the model, normalized prompt and generation config"""
+        key_source = f"{model}|{normalize(prompt)}|{json.dumps(generation_config, sort_keys=True)}"
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into a single execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Run `fn` once per key at a time; concurrent callers share its result"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+class SemanticCache:
+    """Near-duplicate lookup over content embeddings (sentence-transformers + FAISS)
+
+    Entries are grouped by a context key (target params, generation config) so
+    only content rewritten for the same targets can match. Each context holds
+    up to `maxsize` entries; contexts expire after `ttl` seconds, and the least
+    recently used ones are evicted beyond `max_contexts`. The index is per-process.
+
+    The model only sees its first `max_seq_length` word pieces, so longer texts
+    are never embedded (a revised ending would otherwise match the old rewrite),
+    and a hit must also be within `length_ratio` of the cached text's length.
+    """
+
+    def __init__(self, model_name='all-MiniLM-L6-v2', threshold=0.92, maxsize=1024, max_contexts=64, ttl=4 * 3600, length_ratio=0.9):
+        # Heavy optional dependencies (torch via sentence-transformers); only imported when enabled
+        import numpy as np
+        import faiss
+        from sentence_transformers import SentenceTransformer
+        self._np = np
+        self._faiss = faiss
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.length_ratio = length_ratio
+        self._indexes = TTLCache(maxsize=max_contexts, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def probe(self, text):
+        """Return (normalized float32 embedding row, length) for `text`, or None if it would be truncated"""
+        if len(self.model.tokenizer(text)['input_ids']) > self.model.max_seq_length:
+            return None
+        vector = self.model.encode([text], normalize_embeddings=True)
+        return self._np.asarray(vector, dtype='float32'), len(text)
+
+    def get(self, context, probe):
+        vector, length = probe
+        with self._lock:
+            entry = self._indexes.get(context)
+            if entry is None or entry[0].ntotal == 0:
+                return None
+            index, responses = entry
+            scores, ids = index.search(vector, 1)
+            if scores[0][0] >= self.threshold:
+                response, cached_length = responses[ids[0][0]]
+                if min(length, cached_length) >= self.length_ratio * max(length, cached_length):
+                    return response
+        return None
+
+    def set(self, context, probe, response):
+        vector, length = probe
+        with self._lock:
+            entry = self._indexes.get(context)
+            if entry is None or len(entry[1]) >= self.maxsize:
+                # Inner product on normalized vectors is cosine similarity
+                entry = (self._faiss.IndexFlatIP(self.dimension), [])
+                self._indexes[context] = entry
+            index, responses = entry
+            index.add(vector)
+            responses.append((response, length))
+
+def make_semantic_cache():
+    """Build the semantic cache if enabled and its dependencies are installed"""
+    if os.environ.get(SEMANTIC_CACHE_ENV, '').lower() not in ('1', 'true', 'yes'):
+        return None
+    try:
+        return SemanticCache()
+    except ImportError:
+        logger.warning("%s is set but sentence-transformers/faiss are not installed; semantic cache disabled", SEMANTIC_CACHE_ENV)
+        return None
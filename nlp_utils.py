@@ -4,16 +4,28 @@ import nltk
 from bs4 import BeautifulSoup
 import textstat
 import re
+import os
+import math
 import string
+import heapq
+import contextvars
+import logging
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics.pairwise import linear_kernel
 import numpy as np
-from gemini_utils import gemini_rewrite, gemini_generate_assets
+from gemini_utils import gemini_rewrite, gemini_rewrite_stream, gemini_generate_assets
+from tasks import TASK_WORKERS
+
+logger = logging.getLogger(__name__)
 
 # Load spaCy model and download necessary NLTK data
 try:
-    nlp = spacy.load("en_core_web_sm")
+    # Only named entities are read. NER embeds with its own internal tok2vec, so the
+    # shared tok2vec and every component listening to it are not loaded at all
+    nlp = spacy.load("en_core_web_sm", exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"])
 except OSError:
     print("Please install the English model: python -m spacy download en_core_web_sm")
     nlp = None
@@ -28,125 +40,188 @@ try:
 except LookupError:
     nltk.download('stopwords')
 
-try:
-    nltk.data.find('taggers/averaged_perceptron_tagger')
-except LookupError:
-    nltk.download('averaged_perceptron_tagger')
-
 from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.tag import pos_tag
+from nltk.tokenize import sent_tokenize
+
+# Loaded once per process and shared read-only by every optimizer
+STOP_WORDS_EN = frozenset(stopwords.words('english'))
+
+# Alphabetic words of two or more letters; replaces Punkt tokenization for word statistics
+_WORD_RE = re.compile(r'[a-z]{2,}')
+
+# Cheap check for markup so plain text skips the HTML parser
+_HTML_PROBE = re.compile(r'<[A-Za-z!/]')
+
+# Passive voice: "<be> ...ed/...en" or "by <agent> <be>", in a single scan
+_PASSIVE_RE = re.compile(
+    r'\b(?:was|were|been|being|is|are|am)\s+\w+(?:ed|en)\b'
+    r'|\bby\s+\w+\s+(?:was|were|been|being|is|are|am)\b',
+    re.IGNORECASE
+)
+
+# Tone indicators, matched as whole words against the tokenized text
+_FORMAL_INDICATORS = frozenset(['furthermore', 'moreover', 'consequently', 'therefore', 'thus', 'hence'])
+_CASUAL_INDICATORS = frozenset(['really', 'pretty', 'quite', 'stuff', 'things'])
+_EXPERT_INDICATORS = frozenset(['methodology', 'implementation', 'framework', 'analysis', 'evaluation'])
+_PERSUASIVE_INDICATORS = frozenset(['should', 'must', 'important', 'essential', 'critical'])
+# Multi-word indicators need a phrase match instead
+_CASUAL_PHRASES = frozenset(['sort of', 'kind of'])
+_PERSUASIVE_PHRASES = frozenset(['need to'])
+_TONE_PHRASE_RE = re.compile(r'\b(sort of|kind of|need to)\b')
+
+# Stateless (no fit), so one instance is shared across requests and threads
+_TOPIC_VECTORIZER = HashingVectorizer(n_features=2**14, alternate_sign=False, norm='l2', stop_words='english')
+
+# Sort rank for recommendation priorities
+_PRIO = {'high': 3, 'medium': 2, 'low': 1}
+
+def _textstat_round(number, points):
+    """Round the way textstat 0.7.3 does: floor(x * 10**points + copysign(0.5, x))
+
+    Half away from zero for positive numbers; negatives round down, so -15.59
+    becomes -15.7 at one decimal.
+    """
+    scale = 10 ** points
+    return math.floor(number * scale + math.copysign(0.5, number)) / scale
+
+def _compute_readability(text, sentence_count, word_count):
+    """Flesch scores from one syllable pass plus the cached sentence and word counts
+
+    `word_count` is the textstat lexicon count cached by preprocessing, so it
+    covers the same words as the syllable count; the sentence count is the
+    precomputed NLTK one. Formulas and rounding follow textstat 0.7.3, including
+    its zero averages for empty text (grade -15.7, reading ease 206.84).
+    """
+    syllable_count = textstat.syllable_count(text)
+    if sentence_count and word_count:
+        words_per_sentence = _textstat_round(word_count / sentence_count, 1)
+        syllables_per_word = _textstat_round(syllable_count / word_count, 1)
+    else:
+        words_per_sentence = syllables_per_word = 0.0
+    
+    return {
+        'flesch_kincaid_grade': _textstat_round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1),
+        'flesch_reading_ease': _textstat_round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+        'avg_sentence_length': words_per_sentence,
+        'syllable_count': syllable_count
+    }
 
 class ContentOptimizer:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = STOP_WORDS_EN
         
     def preprocess_content(self, text):
         """Step A: Pre-processing"""
-        # Clean HTML tags
-        soup = BeautifulSoup(text, "html.parser")
-        
-        # Extract headings for SEO analysis
-        headings = {
-            'h1': [h.get_text().strip() for h in soup.find_all('h1')],
-            'h2': [h.get_text().strip() for h in soup.find_all('h2')],
-            'h3': [h.get_text().strip() for h in soup.find_all('h3')]
-        }
+        return next(iter(self.preprocess_batch([text])))
+    
+    def preprocess_batch(self, texts):
+        """Step A for several documents, running spaCy over them with one nlp.pipe call"""
+        processed = [self._segment_content(text) for text in texts]
         
-        # Get clean text
-        clean_text = soup.get_text()
+        # Named entities
+        if nlp:
+            # Single process: spawning spaCy workers inside a web worker costs more than it saves
+            docs = nlp.pipe((item['clean_text'] for item in processed), batch_size=64, n_process=1)
+            for item, doc in zip(processed, docs):
+                item['entities'] = [(ent.text, ent.label_) for ent in doc.ents]
+                yield item
+        else:
+            for item in processed:
+                item['entities'] = []
+                yield item
+    
+    def _segment_content(self, text):
+        """HTML cleanup, segmentation and word lists for one document"""
+        if _HTML_PROBE.search(text):
+            # Clean HTML tags
+            soup = BeautifulSoup(text, "lxml")
+            
+            # Extract headings for SEO analysis
+            # One traversal for all levels, bucketed by tag name
+            headings = {'h1': [], 'h2': [], 'h3': []}
+            for h in soup.find_all(['h1', 'h2', 'h3']):
+                headings[h.name].append(h.get_text().strip())
+            
+            # Get clean text
+            clean_text = soup.get_text()
+        else:
+            # Plain text: nothing to parse
+            headings = {'h1': [], 'h2': [], 'h3': []}
+            clean_text = text
         
         # Segmentation
         sentences = sent_tokenize(clean_text)
         paragraphs = [p.strip() for p in clean_text.split('\n\n') if p.strip()]
         
-        # Tokenization and linguistic analysis
-        if nlp:
-            doc = nlp(clean_text)
-            tokens = [(token.text, token.pos_, token.dep_) for token in doc if not token.is_space]
-            entities = [(ent.text, ent.label_) for ent in doc.ents]
-        else:
-            # Fallback to NLTK
-            words = word_tokenize(clean_text)
-            pos_tags = pos_tag(words)
-            tokens = [(word, pos, '') for word, pos in pos_tags]
-            entities = []
+        # Word lists shared by all analyzers, from one regex pass over the lowercased text
+        clean_text_lower = clean_text.lower()
+        words_lower = _WORD_RE.findall(clean_text_lower)
+        alpha_words_nostop = [word for word in words_lower if word not in self.stop_words]
+        word_freq = Counter(alpha_words_nostop)
         
         return {
             'clean_text': clean_text,
+            'clean_text_lower': clean_text_lower,
             'sentences': sentences,
             'paragraphs': paragraphs,
-            'tokens': tokens,
-            'entities': entities,
+            'words_lower': words_lower,
+            'alpha_words_nostop': alpha_words_nostop,
+            # Real word count (numbers and one-letter words included), read by every analyzer
+            'word_count': textstat.lexicon_count(clean_text),
+            'word_freq': word_freq,
             'headings': headings,
             'original_html': text != clean_text
         }
     
-    def analyze_readability(self, text, target_level=8):
+    def analyze_readability(self, processed_content, target_level=8):
         """Analyze readability metrics"""
-        metrics = {
-            'flesch_kincaid_grade': textstat.flesch_kincaid_grade(text),
-            'flesch_reading_ease': textstat.flesch_reading_ease(text),
-            'avg_sentence_length': textstat.avg_sentence_length(text),
-            'difficult_words': textstat.difficult_words(text),
-            'syllable_count': textstat.syllable_count(text),
-            'word_count': len(text.split())
-        }
+        text = processed_content['clean_text']
+        # Sentences come from the single sent_tokenize pass in preprocessing
+        sentence_count = len(processed_content['sentences'])
+        metrics = _compute_readability(text, sentence_count, processed_content['word_count'])
+        metrics['difficult_words'] = textstat.difficult_words(text)
+        metrics['word_count'] = processed_content['word_count']
         
         # Passive voice detection (improved)
         passive_count = self.detect_passive_voice(text)
         metrics['passive_voice_count'] = passive_count
-        metrics['passive_voice_percentage'] = (passive_count / len(sent_tokenize(text))) * 100 if sent_tokenize(text) else 0
+        metrics['passive_voice_percentage'] = (passive_count / sentence_count) * 100 if sentence_count else 0
         
         return metrics
     
     def detect_passive_voice(self, text):
         """Detect passive voice constructions"""
-        passive_patterns = [
-            r'\b(was|were|been|being|is|are|am)\s+\w+ed\b',
-            r'\b(was|were|been|being|is|are|am)\s+\w+en\b',
-            r'\bby\s+\w+\s+(was|were|been|being|is|are|am)',
-        ]
-        
-        passive_count = 0
-        for pattern in passive_patterns:
-            passive_count += len(re.findall(pattern, text, re.IGNORECASE))
-        
-        return passive_count
+        return len(_PASSIVE_RE.findall(text))
     
-    def analyze_topic_coverage(self, text, reference_topics=None):
+    def analyze_topic_coverage(self, processed_content, reference_topics=None):
         """Analyze topic coverage and keyword distribution"""
-        words = [word.lower() for word in word_tokenize(text) 
-                if word.lower() not in self.stop_words and word.isalpha()]
+        text = processed_content['clean_text']
+        words = processed_content['alpha_words_nostop']
         
-        # Word frequency analysis
-        word_freq = Counter(words)
+        # Word frequency analysis; the Counter's keys are the distinct words
+        word_freq = processed_content['word_freq']
+        unique_words = len(word_freq)
+        total_words = len(words)
         
-        # Topic modeling (simplified)
+        # Topic modeling (simplified); hashing needs no fitted vocabulary, so it cannot fail on empty content
         if reference_topics:
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=100)
-            try:
-                text_vector = vectorizer.fit_transform([text])
-                topic_vector = vectorizer.transform(reference_topics)
-                similarity = cosine_similarity(text_vector, topic_vector).mean()
-                coverage_score = min(similarity * 100, 100)
-            except:
-                coverage_score = 50  # Default score if analysis fails
+            vectors = _TOPIC_VECTORIZER.transform([text] + list(reference_topics))
+            # Rows are L2-normalized, so the linear kernel is cosine similarity
+            similarity = linear_kernel(vectors[0:1], vectors[1:]).mean()
+            coverage_score = min(similarity * 100, 100)
         else:
             # Basic coverage based on content length and diversity
-            unique_words = len(set(words))
-            total_words = len(words)
             coverage_score = min((unique_words / max(total_words * 0.1, 1)) * 100, 100)
         
         return {
             'coverage_score': coverage_score,
-            'word_frequency': dict(word_freq.most_common(10)),
-            'unique_words': len(set(words)),
-            'total_words': len(words),
-            'lexical_diversity': len(set(words)) / len(words) if words else 0
+            'word_frequency': dict(heapq.nlargest(10, word_freq.items(), key=itemgetter(1))),
+            'unique_words': unique_words,
+            'total_words': total_words,
+            'lexical_diversity': unique_words / total_words if total_words else 0
         }
     
-    def analyze_seo_features(self, processed_content, text):
+    def analyze_seo_features(self, processed_content):
         """Analyze SEO-related features"""
         headings = processed_content['headings']
         
@@ -157,42 +232,36 @@ class ContentOptimizer:
                 'h3_count': len(headings['h3']),
                 'proper_hierarchy': len(headings['h1']) == 1 and len(headings['h2']) > 0
             },
-            'content_length': len(text.split()),
+            'content_length': processed_content['word_count'],
             'meta_title_length': len(headings['h1'][0]) if headings['h1'] else 0,
-            'keyword_density': self.calculate_keyword_density(text)
+            'keyword_density': self.calculate_keyword_density(processed_content)
         }
         
         return seo_analysis
     
-    def calculate_keyword_density(self, text, top_n=5):
+    def calculate_keyword_density(self, processed_content, top_n=5):
         """Calculate keyword density for top keywords"""
-        words = [word.lower() for word in word_tokenize(text) 
-                if word.lower() not in self.stop_words and word.isalpha() and len(word) > 3]
-        
-        total_words = len(words)
-        word_freq = Counter(words)
+        word_freq = {word: count for word, count in processed_content['word_freq'].items() if len(word) > 3}
+        total_words = sum(word_freq.values())
         
         density = {}
-        for word, count in word_freq.most_common(top_n):
+        for word, count in heapq.nlargest(top_n, word_freq.items(), key=itemgetter(1)):
             density[word] = (count / total_words) * 100
         
         return density
     
-    def detect_tone(self, text):
+    def detect_tone(self, processed_content):
         """Detect tone and style of the content"""
-        # Simplified tone detection based on linguistic features
-        formal_indicators = ['furthermore', 'moreover', 'consequently', 'therefore', 'thus', 'hence']
-        casual_indicators = ['really', 'pretty', 'quite', 'sort of', 'kind of', 'stuff', 'things']
-        expert_indicators = ['methodology', 'implementation', 'framework', 'analysis', 'evaluation']
-        persuasive_indicators = ['should', 'must', 'need to', 'important', 'essential', 'critical']
-        
-        text_lower = text.lower()
+        # Simplified tone detection based on linguistic features:
+        # each indicator present in the text scores one point
+        word_set = set(processed_content['words_lower'])
+        phrases = set(_TONE_PHRASE_RE.findall(processed_content['clean_text_lower']))
         
         scores = {
-            'formal': sum(1 for indicator in formal_indicators if indicator in text_lower),
-            'casual': sum(1 for indicator in casual_indicators if indicator in text_lower),
-            'expert': sum(1 for indicator in expert_indicators if indicator in text_lower),
-            'persuasive': sum(1 for indicator in persuasive_indicators if indicator in text_lower)
+            'formal': len(_FORMAL_INDICATORS & word_set),
+            'casual': len(_CASUAL_INDICATORS & word_set) + len(_CASUAL_PHRASES & phrases),
+            'expert': len(_EXPERT_INDICATORS & word_set),
+            'persuasive': len(_PERSUASIVE_INDICATORS & word_set) + len(_PERSUASIVE_PHRASES & phrases)
         }
         
         # Determine dominant tone
@@ -201,7 +270,7 @@ class ContentOptimizer:
         return {
             'detected_tone': dominant_tone,
             'tone_scores': scores,
-            'confidence': max(scores.values()) / len(text.split()) * 100 if text.split() else 0
+            'confidence': max(scores.values()) / processed_content['word_count'] * 100 if processed_content['word_count'] else 0
         }
     
     def generate_recommendations(self, analysis_results, target_params):
@@ -310,11 +379,22 @@ class ContentOptimizer:
                 'target_value': 0.5
             })
         
-        return sorted(recommendations, key=lambda x: {'high': 3, 'medium': 2, 'low': 1}[x['priority']], reverse=True)
+        recommendations.sort(key=lambda rec: _PRIO[rec['priority']], reverse=True)
+        return recommendations
 
-def process_content(data):
-    """Main content processing function"""
-    optimizer = ContentOptimizer()
+# Shared analyzer; it holds no per-request state
+_OPTIMIZER = ContentOptimizer()
+
+# Long-lived pool for the four Step B analyzers, so requests don't pay thread start-up
+_ANALYZER_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='analyzer')
+
+# Runs asset generation alongside each rewrite; one slot per thread that can call
+# generate_rewrite (gunicorn request threads, see gunicorn.conf.py, plus task workers)
+_ASSETS_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get('GUNICORN_THREADS', 32)) + TASK_WORKERS, thread_name_prefix='assets')
+
+def process_content(data, processed_content=None, optimizer=None):
+    """Main content processing function; reuses `processed_content` if already preprocessed"""
+    optimizer = optimizer or _OPTIMIZER
     
     text = data['content']
     target_params = {
@@ -325,20 +405,23 @@ def process_content(data):
     }
     
     # Step A: Pre-processing
-    processed_content = optimizer.preprocess_content(text)
+    if processed_content is None:
+        processed_content = optimizer.preprocess_content(text)
     
-    # Step B: Content Analysis
-    readability_analysis = optimizer.analyze_readability(processed_content['clean_text'], target_params['target_readability'])
-    topic_analysis = optimizer.analyze_topic_coverage(processed_content['clean_text'])
-    seo_analysis = optimizer.analyze_seo_features(processed_content, processed_content['clean_text'])
-    tone_analysis = optimizer.detect_tone(processed_content['clean_text'])
+    # Step B: Content Analysis (analyzers only read processed_content, so they run side by side)
+    futures = {
+        'readability': _ANALYZER_POOL.submit(optimizer.analyze_readability, processed_content, target_params['target_readability']),
+        'topic_coverage': _ANALYZER_POOL.submit(optimizer.analyze_topic_coverage, processed_content),
+        'seo': _ANALYZER_POOL.submit(optimizer.analyze_seo_features, processed_content),
+        'tone': _ANALYZER_POOL.submit(optimizer.detect_tone, processed_content)
+    }
     
     # Compile analysis results
     analysis_results = {
-        'readability': readability_analysis,
-        'topic_coverage': topic_analysis,
-        'seo': seo_analysis,
-        'tone': tone_analysis,
+        'readability': futures['readability'].result(),
+        'topic_coverage': futures['topic_coverage'].result(),
+        'seo': futures['seo'].result(),
+        'tone': futures['tone'].result(),
         'structure': {
             'sentence_count': len(processed_content['sentences']),
             'paragraph_count': len(processed_content['paragraphs']),
@@ -394,33 +477,60 @@ def calculate_seo_score(seo_analysis):
     
     return max(0, min(100, score))
 
-def generate_rewrite(data):
-    """Generate rewritten content and assets using Gemini AI"""
-    content = data['content']
-    target_params = {
+def rewrite_target_params(data):
+    """Target parameters passed to the Gemini rewriter"""
+    return {
         'target_audience': data.get('target_audience', 'general audience'),
         'target_readability': data.get('target_readability', 8),
         'target_tone': data.get('target_tone', 'professional'),
         'optimization_goal': data.get('optimization_goal', 'engagement')
     }
+
+def _submit_assets(content, target_params):
+    """Start the asset Gemini call in the background"""
+    # Runs in a copy of this context so its X-Cache lookup still reaches the request
+    return _ASSETS_POOL.submit(contextvars.copy_context().run, gemini_generate_assets, content, target_params)
+
+def _rewrite_with_assets(content, target_params, recommendations=None):
+    """Rewrite on this thread while the assets are generated concurrently"""
+    assets_future = _submit_assets(content, target_params)
+    rewritten = gemini_rewrite(content, recommendations=recommendations, target_params=target_params)
+    return rewritten, assets_future.result()
+
+def generate_rewrite(data):
+    """Generate rewritten content and assets using Gemini AI"""
+    content = data['content']
+    target_params = rewrite_target_params(data)
     
     # First analyze the content to get recommendations
     try:
-        optimizer = ContentOptimizer()
-        preprocessed_content = optimizer.preprocess_content(content)
-        report, recommendations = process_content(data)
+        optimizer = _OPTIMIZER
+        processed_content = optimizer.preprocess_content(content)
+        report, recommendations = process_content(data, processed_content=processed_content, optimizer=optimizer)
         
-        # Pass both recommendations and target parameters to AI rewriter
-        rewritten = gemini_rewrite(content, recommendations=recommendations, target_params=target_params)
-        
-        # Generate additional assets
-        assets = gemini_generate_assets(content, target_params)
-        
-        return rewritten, assets
+        # Pass both recommendations and target parameters to AI rewriter, generating assets alongside
+        return _rewrite_with_assets(content, target_params, recommendations=recommendations)
         
     except Exception as e:
-        print(f"Error in generate_rewrite: {str(e)}")
+        logger.exception("Error in generate_rewrite: %s", e)
         # Fallback to simple rewrite without recommendations
-        rewritten = gemini_rewrite(content, target_params=target_params)
-        assets = gemini_generate_assets(content, target_params)
-        return rewritten, assets
+        return _rewrite_with_assets(content, target_params)
+
+def generate_rewrite_stream(data):
+    """Stream the Gemini rewrite as ('chunk', {'text': ...}) events, then ('assets', assets)"""
+    content = data['content']
+    target_params = rewrite_target_params(data)
+    
+    try:
+        report, recommendations = process_content(data)
+    except Exception as e:
+        logger.exception("Error in generate_rewrite_stream: %s", e)
+        # Fall back to a simple rewrite without recommendations
+        recommendations = None
+    
+    # Assets are generated while the rewrite streams, and sent after its last chunk
+    assets_future = _submit_assets(content, target_params)
+    for chunk in gemini_rewrite_stream(content, recommendations=recommendations, target_params=target_params):
+        yield 'chunk', {'text': chunk}
+    
+    yield 'assets', assets_future.result()
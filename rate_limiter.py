@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import deque
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; otherwise return seconds until they will be"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self.rate
+
+    def drain(self, tokens=1):
+        """Remove tokens without waiting, e.g. after the upstream reports a 429"""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+class KeyPool:
+    """Round-robin pool of API keys, each with its own token bucket"""
+
+    def __init__(self, keys, rate, capacity):
+        self._keys = deque(keys)
+        self._buckets = {key: TokenBucket(rate, capacity) for key in keys}
+        self._cooldown_until = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Return the next key with quota; None if none frees up within `timeout`"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            soonest = None
+            with self._lock:
+                now = time.monotonic()
+                for _ in range(len(self._keys)):
+                    key = self._keys[0]
+                    self._keys.rotate(-1)
+                    wait = self._cooldown_until.get(key, 0) - now
+                    if wait <= 0:
+                        wait = self._buckets[key].try_acquire()
+                        if wait == 0:
+                            return key
+                    soonest = wait if soonest is None else min(soonest, wait)
+            if deadline is not None and time.monotonic() + soonest > deadline:
+                return None
+            time.sleep(soonest)
+
+    def cool_down(self, key, seconds):
+        """Take a key out of rotation after the upstream reported a 429"""
+        with self._lock:
+            self._cooldown_until[key] = time.monotonic() + seconds
+        self._buckets[key].drain()
@@ -179,7 +179,7 @@ class ContentOptimizer {
             const formData = this.getFormData();
             // No need to get API key from form - it's hardcoded in the backend
             
-            const response = await fetch('/rewrite', {
+            const response = await fetch('/rewrite/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -187,13 +187,26 @@ class ContentOptimizer {
                 body: JSON.stringify(formData)
             });
 
-            const data = await response.json();
-
-            if (data.success) {
-                this.displayEnhancedContent(data.rewritten, data.assets);
-            } else {
+            if (!response.ok) {
+                const data = await response.json().catch(() => ({}));
                 this.showError(data.error || 'An error occurred during rewriting');
+                return;
             }
+
+            // Render the rewrite as it arrives; assets follow once it is complete
+            let rewritten = '';
+            let assets = {};
+            await this.readEventStream(response, (event, payload) => {
+                if (event === 'chunk') {
+                    if (!rewritten) this.hideLoading();
+                    rewritten += payload.text;
+                    this.displayStreamingRewrite(rewritten);
+                } else if (event === 'assets') {
+                    assets = payload;
+                }
+            });
+
+            this.displayEnhancedContent(rewritten, assets);
         } catch (error) {
             console.error('Error:', error);
             this.showError('Network error occurred. Please try again.');
@@ -202,6 +215,45 @@ class ContentOptimizer {
         }
     }
 
+    async readEventStream(response, onEvent) {
+        // Minimal server-sent events parser; EventSource cannot send a POST body
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                });
+                if (data) onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+
+    displayStreamingRewrite(text) {
+        const rewrittenContainer = document.querySelector('#rewritten .rewritten-content');
+        const enhancedSection = document.getElementById('enhancedContentSection');
+        if (enhancedSection.style.display !== 'block') {
+            enhancedSection.style.display = 'block';
+            enhancedSection.scrollIntoView({ behavior: 'smooth' });
+        }
+
+        const formattedContent = typeof marked !== 'undefined' ? marked.parse(text) : this.formatContent(text);
+        rewrittenContainer.innerHTML = `<div class="rendered-content markdown-content">${formattedContent}</div>`;
+    }
+
     getFormData() {
         return {
             content: document.getElementById('content').value,
@@ -0,0 +1,41 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TTLCache
+
+# Background threads for the async endpoints
+TASK_WORKERS = 8
+
+class TaskRunner:
+    """Runs jobs on a background thread pool and tracks them by task id
+
+    Task state lives in this process, so status must be polled on the worker
+    that accepted the job (single gunicorn worker or sticky sessions).
+    """
+
+    def __init__(self, max_workers=TASK_WORKERS, maxsize=1024, ttl=3600):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self._futures = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn` and return its task id"""
+        task_id = uuid.uuid4().hex
+        future = self._executor.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._futures[task_id] = future
+        return task_id
+
+    def status(self, task_id):
+        """Return the task state and, once finished, its result or error"""
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is None:
+            return None
+        if not future.done():
+            return {'task_id': task_id, 'state': 'STARTED' if future.running() else 'PENDING'}
+        error = future.exception()
+        if error is not None:
+            return {'task_id': task_id, 'state': 'FAILURE', 'error': str(error)}
+        return {'task_id': task_id, 'state': 'SUCCESS', 'result': future.result()}